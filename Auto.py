@@ -5,8 +5,8 @@ import logging
 from logging.handlers import RotatingFileHandler
 import signal
 import sys
-import time
 from pathlib import Path
+from typing import Iterator, Optional
 
 from automation_tool.controller import AutomationController
 from automation_tool.gui import AutomationGUI
@@ -35,39 +35,33 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def _resolve_config_path(raw_config: str) -> Path:
-    candidate = Path(raw_config).expanduser()
-
-    search_paths = [candidate]
-    if not candidate.is_absolute():
-        search_paths.extend(
-            [
-                Path.cwd() / candidate,
-                Path(__file__).resolve().parent / candidate,
-                Path(sys.executable).resolve().parent / candidate,
-            ]
-        )
+def _config_candidates(candidate: Path) -> Iterator[Path]:
+    # A relative candidate already resolves against the working directory.
+    yield candidate
+    yield Path(__file__).resolve().parent / candidate
+    yield Path(sys.executable).resolve().parent / candidate
 
     bundle_dir = getattr(sys, "_MEIPASS", None)
     if bundle_dir:
-        bundle_candidate = Path(bundle_dir) / candidate
-        search_paths.append(bundle_candidate)
+        yield Path(bundle_dir) / candidate
         if candidate.name != candidate.as_posix():
-            search_paths.append(Path(bundle_dir) / candidate.name)
-
-    seen = set()
-    for path in search_paths:
-        norm = str(path)
-        if norm in seen:
-            continue
-        seen.add(norm)
-        try:
-            if path.exists():
-                return path.resolve()
-        except OSError:
-            continue
+            yield Path(bundle_dir) / candidate.name
+
+
+def _exists(path: Path) -> bool:
+    try:
+        return path.exists()
+    except OSError:
+        return False
 
-    return candidate.resolve()
+
+def _resolve_config_path(raw_config: str) -> Path:
+    candidate = Path(raw_config).expanduser()
+    if candidate.is_absolute():
+        return candidate.resolve()
+
+    found = next((path for path in _config_candidates(candidate) if _exists(path)), None)
+    return (found or candidate).resolve()
 
 
 def main() -> int:
@@ -77,10 +71,14 @@ def main() -> int:
 
     controller = AutomationController(config_path)
 
+    gui: Optional[AutomationGUI] = None
+
     def handle_shutdown(_signum=None, _frame=None):
         logging.getLogger(__name__).info("Shutting down automation")
         controller.shutdown()
-        sys.exit(0)
+        if gui is not None:
+            # Tk only runs Python between events, so the update loop polls for this.
+            gui.request_close()
 
     signal.signal(signal.SIGINT, handle_shutdown)
     if hasattr(signal, "SIGTERM"):
@@ -95,16 +93,17 @@ def main() -> int:
             logging.getLogger(__name__).exception("Failed to start GUI: %s", exc)
             print("GUI unavailable, falling back to headless mode", file=sys.stderr)
 
+    if controller.load_error:
+        logging.getLogger(__name__).error("Cannot run headless: %s", controller.load_error)
+        controller.shutdown()
+        return 1
     controller.start()
     logging.getLogger(__name__).info("Automation running in headless mode. Use %s to pause/resume.", controller.config.hotkeys.pause_resume)
     try:
-        while True:
-            if controller.shutdown_requested():
-                break
+        while not controller.wait_for_shutdown(timeout=1.0):
             if not controller.engine.is_running():
                 logging.getLogger(__name__).warning("Automation engine stopped; exiting main loop")
                 break
-            time.sleep(0.5)
     except KeyboardInterrupt:
         pass
     finally:
@@ -3,12 +3,15 @@ from __future__ import annotations
 import logging
 import threading
 import time
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
 from .clicker import ClickExecutor
 from .config_loader import AppConfig, Point
 from .detection import DetectionManager, TradeStatus
 
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import numpy as np
+
 LOGGER = logging.getLogger(__name__)
 
 
@@ -19,10 +22,12 @@ class AutomationEngine:
         self._clicker = ClickExecutor(config.clicks)
         self._thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
-        self._pause_event = threading.Event()
-        self._pause_event.set()  # start unpaused
+        self._pause_cv = threading.Condition()
+        self._paused = False
         self._lock = threading.Lock()
         self._last_statuses: List[TradeStatus] = []
+        self._statuses_version = 0
+        self._frames_version = 0
         self._last_collect_ts = 0.0
         self._last_refresh_ts = 0.0
 
@@ -31,68 +36,105 @@ class AutomationEngine:
         with self._lock:
             return list(self._last_statuses)
 
+    @property
+    def statuses_version(self) -> int:
+        return self._statuses_version
+
+    @property
+    def frames_version(self) -> int:
+        return self._frames_version
+
     def start(self) -> None:
         if self._thread and self._thread.is_alive():
             LOGGER.debug("Automation already running")
             return
         self._stop_event.clear()
-        self._pause_event.set()
+        with self._pause_cv:
+            self._paused = False
         self._thread = threading.Thread(target=self._run_loop, name="trade-automation", daemon=True)
         self._thread.start()
         LOGGER.info("Automation loop started")
 
     def stop(self) -> None:
         self._stop_event.set()
+        with self._pause_cv:
+            self._pause_cv.notify_all()
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=2.0)
         LOGGER.info("Automation loop stopped")
 
     def pause(self) -> None:
-        self._pause_event.clear()
-        LOGGER.info("Automation paused")
+        self._set_paused(True)
 
     def resume(self) -> None:
-        self._pause_event.set()
-        LOGGER.info("Automation resumed")
+        self._set_paused(False)
 
     def toggle_pause(self) -> bool:
-        if self._pause_event.is_set():
-            self.pause()
-            return True
-        self.resume()
-        return False
+        with self._pause_cv:
+            paused = not self._paused
+            self._set_paused(paused)
+        return paused
+
+    def _set_paused(self, paused: bool) -> None:
+        with self._pause_cv:
+            self._paused = paused
+            self._pause_cv.notify_all()
+        LOGGER.info("Automation %s", "paused" if paused else "resumed")
 
     def is_running(self) -> bool:
         return bool(self._thread and self._thread.is_alive())
 
     def is_paused(self) -> bool:
-        return not self._pause_event.is_set()
+        return self._paused
+
+    def _halted(self) -> bool:
+        return self._paused or self._stop_event.is_set()
 
     def last_frames(self):
         return self._detection.last_frames
 
+    def primary_frame(self) -> Optional[Tuple[str, np.ndarray]]:
+        # The preview follows config order, not whichever frame was stored first.
+        frames = self._detection.last_frames
+        for trade in self._config.trades:
+            frame = frames.get(trade.name)
+            if frame is not None:
+                return trade.name, frame
+        return None
+
     def _update_statuses(self, statuses: List[TradeStatus]) -> None:
         with self._lock:
+            if statuses != self._last_statuses:
+                self._statuses_version += 1
             self._last_statuses = statuses
+            # Every cycle captures fresh frames, even when the statuses are unchanged.
+            self._frames_version += 1
 
     def _run_loop(self) -> None:  # pragma: no cover - run loop difficult to unit test
         cycle_delay = max(self._config.cycle_delay, 0.05)
         while not self._stop_event.is_set():
-            if not self._pause_event.is_set():
-                time.sleep(0.1)
-                continue
+            with self._pause_cv:
+                while self._paused and not self._stop_event.is_set():
+                    self._pause_cv.wait(timeout=1.0)
+            if self._stop_event.is_set():
+                break
             cycle_start = time.time()
             statuses = self._detection.evaluate_all()
             self._update_statuses(statuses)
+            if self._halted():
+                continue
             click_performed = self._handle_trades(statuses)
             self._handle_collect()
             self._handle_refresh(statuses, click_performed)
             elapsed = time.time() - cycle_start
-            time.sleep(max(cycle_delay - elapsed, 0.01))
+            if self._stop_event.wait(max(cycle_delay - elapsed, 0.01)):
+                break
 
     def _handle_trades(self, statuses: List[TradeStatus]) -> bool:
         any_click = False
         for trade, status in zip(self._config.trades, statuses):
+            if self._halted():
+                break
             if status.has_red_gem:
                 if status.start_active is None or status.start_active:
                     LOGGER.info("Red gem detected for %s (ratio %.3f) -> clicking start", trade.name, status.red_ratio)
@@ -138,3 +180,4 @@ class AutomationEngine:
 
     def shutdown(self) -> None:
         self.stop()
+        self._detection.close()
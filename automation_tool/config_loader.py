@@ -4,7 +4,8 @@ import json
 import logging
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Tuple
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
 
 try:
     import yaml  # type: ignore
@@ -50,6 +51,15 @@ class Region:
     def to_monitor(self) -> Dict[str, int]:
         return {"left": self.left, "top": self.top, "width": self.width, "height": self.height}
 
+    def clipped_to(self, bounds: "Region") -> Optional["Region"]:
+        left = max(bounds.left, self.left)
+        top = max(bounds.top, self.top)
+        right = min(bounds.left + bounds.width, self.left + self.width)
+        bottom = min(bounds.top + bounds.height, self.top + self.height)
+        if right <= left or bottom <= top:
+            return None
+        return Region(left=left, top=top, width=right - left, height=bottom - top)
+
 
 @dataclass(frozen=True)
 class HSVRange:
@@ -77,6 +87,7 @@ class TemplateConfig:
     name: str
     path: Path
     threshold: float
+    method: str = "ccoeff"
 
 
 @dataclass(frozen=True)
@@ -87,6 +98,8 @@ class TradeConfig:
     start_template: Optional[str] = None
     start_gray_template: Optional[str] = None
     red_ratio_threshold: float = 0.01
+    start_button_roi: Optional[Region] = None
+    monitor_dict: Mapping[str, int] = field(default_factory=lambda: MappingProxyType({}), compare=False)
 
 
 @dataclass(frozen=True)
@@ -97,6 +110,14 @@ class TimingConfig:
     post_click_delay: float = 0.15
 
 
+@dataclass(frozen=True)
+class DetectionConfig:
+    change_threshold: float = 0.1
+    max_reuse_cycles: int = 10
+    color_downsample: int = 2
+    use_opencl: bool = True
+
+
 @dataclass(frozen=True)
 class ClickConfig:
     use_win32: bool = False
@@ -110,6 +131,11 @@ class HotkeyConfig:
     shutdown: str = "f10"
 
 
+@dataclass(frozen=True)
+class GuiConfig:
+    maximum_framerate: float = 1.0
+
+
 @dataclass
 class AppConfig:
     monitor: Region
@@ -119,20 +145,32 @@ class AppConfig:
     hsv_ranges: List[HSVRange]
     templates: Dict[str, TemplateConfig] = field(default_factory=dict)
     timing: TimingConfig = field(default_factory=TimingConfig)
+    detection: DetectionConfig = field(default_factory=DetectionConfig)
     clicks: ClickConfig = field(default_factory=ClickConfig)
     hotkeys: HotkeyConfig = field(default_factory=HotkeyConfig)
+    gui: GuiConfig = field(default_factory=GuiConfig)
     cycle_delay: float = 0.5
 
 
 class ConfigLoader:
     def __init__(self, path: Path):
         self.path = path
+        self._cache: Optional[Tuple[int, int, AppConfig]] = None
 
     def load(self) -> AppConfig:
-        if not self.path.exists():
-            raise FileNotFoundError(f"Config file not found: {self.path}")
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Config file not found: {self.path}") from None
+        if self._cache and self._cache[:2] == (stat.st_mtime_ns, stat.st_size):
+            return self._cache[2]
         data = self._read_raw()
-        return self._parse(data)
+        config = self._parse(data)
+        self._cache = (stat.st_mtime_ns, stat.st_size, config)
+        return config
+
+    def invalidate(self) -> None:
+        self._cache = None
 
     def _read_raw(self) -> Dict[str, object]:
         suffix = self.path.suffix.lower()
@@ -159,10 +197,26 @@ class ConfigLoader:
                 raise ValueError("Each trade entry must be a mapping")
             name = str(entry.get("name") or f"trade_{len(trades)+1}")
             region = Region.from_mapping(entry.get("region", {}), f"trade {name} region")
+            capture = region.clipped_to(monitor)
+            if capture is None:
+                raise ValueError(f"Trade {name} region lies outside the monitor")
+            if capture != region:
+                LOGGER.warning("Trade %s region extends past the monitor; clipping to %s", name, capture)
             start_button = Point.from_mapping(entry.get("start_button", {}), f"trade {name} start_button")
             start_template = entry.get("start_template")
             start_gray_template = entry.get("start_gray_template")
             red_ratio_threshold = float(entry.get("red_ratio_threshold", 0.01))
+            roi_raw = entry.get("start_button_roi")
+            start_button_roi = Region.from_mapping(roi_raw, f"trade {name} start_button_roi") if roi_raw else None
+            if start_button_roi is not None:
+                roi_capture = start_button_roi.clipped_to(capture)
+                if roi_capture is None:
+                    raise ValueError(f"Trade {name} start_button_roi lies outside the trade region")
+                if roi_capture != start_button_roi:
+                    LOGGER.warning(
+                        "Trade %s start_button_roi extends past the trade region; clipping to %s", name, roi_capture
+                    )
+                    start_button_roi = roi_capture
             trades.append(
                 TradeConfig(
                     name=name,
@@ -171,6 +225,8 @@ class ConfigLoader:
                     start_template=start_template,
                     start_gray_template=start_gray_template,
                     red_ratio_threshold=red_ratio_threshold,
+                    start_button_roi=start_button_roi,
+                    monitor_dict=MappingProxyType(capture.to_monitor()),
                 )
             )
 
@@ -193,10 +249,14 @@ class ConfigLoader:
                 if not rel_path:
                     raise ValueError(f"Template {name} requires a `path`")
                 threshold = float(template_entry.get("threshold", 0.8))
+                method = str(template_entry.get("method", "ccoeff")).lower()
+                if method not in {"ccoeff", "sqdiff"}:
+                    raise ValueError(f"Template {name} method must be `ccoeff` or `sqdiff`")
                 templates[name] = TemplateConfig(
                     name=name,
                     path=(base_dir / rel_path).resolve(),
                     threshold=threshold,
+                    method=method,
                 )
 
         timing_raw = data.get("timing", {})
@@ -207,6 +267,14 @@ class ConfigLoader:
             post_click_delay=float(timing_raw.get("post_click_delay", 0.15)),
         )
 
+        detection_raw = data.get("detection", {})
+        detection = DetectionConfig(
+            change_threshold=float(detection_raw.get("change_threshold", 0.1)),
+            max_reuse_cycles=int(detection_raw.get("max_reuse_cycles", 10)),
+            color_downsample=max(1, int(detection_raw.get("color_downsample", 2))),
+            use_opencl=bool(detection_raw.get("use_opencl", True)),
+        )
+
         clicks_raw = data.get("clicks", {})
         clicks = ClickConfig(
             use_win32=bool(clicks_raw.get("use_win32", False)),
@@ -220,6 +288,9 @@ class ConfigLoader:
             shutdown=str(hotkeys_raw.get("shutdown", "f10")),
         )
 
+        gui_raw = data.get("gui", {})
+        gui = GuiConfig(maximum_framerate=max(0.1, float(gui_raw.get("maximum_framerate", 1.0))))
+
         return AppConfig(
             monitor=monitor,
             trades=trades,
@@ -228,7 +299,9 @@ class ConfigLoader:
             hsv_ranges=hsv_ranges,
             templates=templates,
             timing=timing,
+            detection=detection,
             clicks=clicks,
             hotkeys=hotkeys,
+            gui=gui,
             cycle_delay=float(data.get("cycle_delay", timing.cycle_delay)),
         )
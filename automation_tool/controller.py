@@ -20,7 +20,12 @@ class AutomationController:
         self._hotkeys: List[HotkeyListener] = []
         self._config: Optional[AppConfig] = None
         self._shutdown_event = threading.Event()
-        self.reload_config()
+        self._load_error: Optional[str] = None
+        try:
+            self.reload_config()
+        except Exception as exc:
+            # Keep the controller usable so the GUI can report the problem and Reload can retry.
+            LOGGER.error("Automation engine not started: %s", exc)
 
     @property
     def engine(self) -> AutomationEngine:
@@ -28,6 +33,10 @@ class AutomationController:
             raise RuntimeError("Automation engine not initialized")
         return self._engine
 
+    @property
+    def load_error(self) -> Optional[str]:
+        return self._load_error
+
     @property
     def config(self) -> AppConfig:
         if not self._config:
@@ -49,14 +58,36 @@ class AutomationController:
             self._engine.shutdown()
 
     def reload_config(self) -> None:
+        try:
+            self._reload()
+        except Exception as exc:
+            self._load_error = str(exc)
+            raise
+        self._load_error = None
+
+    def _reload(self) -> None:
         LOGGER.info("Loading configuration from %s", self._config_path)
         config = self._config_loader.load()
+        if config is self._config and self._engine:
+            LOGGER.info("Configuration unchanged; keeping current engine")
+            return
         if self._engine:
             self._engine.shutdown()
+            self._engine = None
         self._stop_hotkeys()
+        try:
+            self._engine = AutomationEngine(config)
+            self._setup_hotkeys(config)
+        except Exception:
+            # Forget the parsed file so the next reload retries the build
+            # (e.g. after a missing template has been restored).
+            self._config_loader.invalidate()
+            self._stop_hotkeys()
+            if self._engine:
+                self._engine.shutdown()
+                self._engine = None
+            raise
         self._config = config
-        self._engine = AutomationEngine(config)
-        self._setup_hotkeys(config)
 
     def toggle_pause(self) -> bool:
         return self.engine.toggle_pause()
@@ -68,6 +99,9 @@ class AutomationController:
     def shutdown_requested(self) -> bool:
         return self._shutdown_event.is_set()
 
+    def wait_for_shutdown(self, timeout: Optional[float] = None) -> bool:
+        return self._shutdown_event.wait(timeout)
+
     def _on_pause_hotkey(self) -> None:
         paused = self.engine.toggle_pause()
         LOGGER.info("Hotkey toggled pause; paused=%s", paused)
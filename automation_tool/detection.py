@@ -1,20 +1,42 @@
 from __future__ import annotations
 
 import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from threading import Lock
-from typing import Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
 
 import cv2
 import mss
 import numpy as np
 
-from .config_loader import AppConfig, HSVRange, Region, TemplateConfig, TradeConfig
+from .config_loader import AppConfig, DetectionConfig, HSVRange, Region, TemplateConfig, TradeConfig
 
 LOGGER = logging.getLogger(__name__)
 
 
+# Assumed lower bound on how much a gem pixel differs (mean over B, G, R) from
+# what it covers; the change gate stays 4x below a gem at the red threshold.
+_MIN_GEM_CONTRAST = 32.0
+
+
+def _change_limit(trade: TradeConfig, settings: DetectionConfig) -> float:
+    return min(settings.change_threshold, trade.red_ratio_threshold * _MIN_GEM_CONTRAST / 4.0)
+
+
+def _region_changed(
+    previous: np.ndarray, frame: np.ndarray, limit: float, scratch: Optional[np.ndarray] = None
+) -> bool:
+    diff = cv2.absdiff(frame, previous, dst=scratch)
+    # Captured alpha carries no image data, so only B, G and R are compared.
+    channels = min(frame.shape[2], 3) if frame.ndim == 3 else 1
+    total = sum(cv2.sumElems(diff)[:channels])
+    return total >= frame.shape[0] * frame.shape[1] * channels * limit
+
+
 @dataclass
 class TradeStatus:
     name: str
@@ -26,81 +48,145 @@ class TradeStatus:
 
 
 class ScreenGrabber:
+    # DetectionManager builds this on the controller/GUI thread, but only the
+    # automation thread grabs from it, one cycle at a time. mss serialises
+    # grab() with its own lock, so a rare capture_monitor() from another
+    # thread waits for the cycle's grab rather than racing it.
     def __init__(self, monitor_region: Region):
         self._monitor = monitor_region
+        self._monitor_dict = MappingProxyType(monitor_region.to_monitor())
         self._sct = mss.mss()
-        self._lock = Lock()
 
-    def grab(self, region: Region) -> np.ndarray:
-        bounded = self._bounded_region(region)
-        with self._lock:
-            raw = self._sct.grab(bounded)
-        frame = np.array(raw)
-        return cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
+    # Frames stay BGRA; OpenCV's BGR2HSV and BGRA2GRAY conversions read
+    # four-channel input directly, so dropping alpha would be a wasted copy.
+    def grab(self, trade: TradeConfig) -> np.ndarray:
+        return self.grab_area(trade.monitor_dict)
+
+    def grab_area(self, area: Mapping[str, int]) -> np.ndarray:
+        return self._to_array(self._sct.grab(area))
 
     def grab_monitor(self) -> np.ndarray:
-        with self._lock:
-            raw = self._sct.grab(self._monitor.to_monitor())
-        return cv2.cvtColor(np.array(raw), cv2.COLOR_BGRA2BGR)
+        return self._to_array(self._sct.grab(self._monitor_dict))
 
-    def _bounded_region(self, region: Region) -> Dict[str, int]:
-        left = max(self._monitor.left, region.left)
-        top = max(self._monitor.top, region.top)
-        right = min(self._monitor.left + self._monitor.width, region.left + region.width)
-        bottom = min(self._monitor.top + self._monitor.height, region.top + region.height)
-        width = max(1, right - left)
-        height = max(1, bottom - top)
-        return {"left": left, "top": top, "width": width, "height": height}
+    @staticmethod
+    def _to_array(raw) -> np.ndarray:
+        # Zero-copy view over the screenshot's BGRA bytearray. mss allocates a
+        # fresh buffer per grab, so views stay valid after the next capture.
+        return np.frombuffer(raw.raw, dtype=np.uint8).reshape(raw.height, raw.width, 4)
 
 
 class ColorDetector:
-    def __init__(self, hsv_ranges: List[HSVRange], minimum_ratio: float = 0.01):
+    def __init__(self, hsv_ranges: List[HSVRange], minimum_ratio: float = 0.01, downsample: int = 2):
         self._ranges = hsv_ranges
         self._minimum_ratio = minimum_ratio
+        self._downsample = max(1, downsample)
+        self._lowers = [np.asarray(hsv_range.lower, dtype=np.uint8) for hsv_range in hsv_ranges]
+        self._uppers = [np.asarray(hsv_range.upper, dtype=np.uint8) for hsv_range in hsv_ranges]
+        # Scratch masks are per thread so trades can be evaluated concurrently.
+        self._local = threading.local()
+
+    def _scratch(self, shape: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+        mask_scratch: Dict[Tuple[int, int], Tuple[np.ndarray, np.ndarray]] = getattr(self._local, "mask_scratch", {})
+        self._local.mask_scratch = mask_scratch
+        buffers = mask_scratch.get(shape)
+        if buffers is None:
+            buffers = (np.empty(shape, dtype=np.uint8), np.empty(shape, dtype=np.uint8))
+            mask_scratch[shape] = buffers
+        return buffers
 
-    def red_ratio(self, frame_bgr: np.ndarray) -> float:
-        hsv = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2HSV)
-        mask = np.zeros(hsv.shape[:2], dtype=np.uint8)
-        for hsv_range in self._ranges:
-            section = cv2.inRange(hsv, np.array(hsv_range.lower), np.array(hsv_range.upper))
-            cv2.bitwise_or(mask, section, mask)
-        ratio = float(np.count_nonzero(mask)) / float(mask.size)
-        return ratio
+    def sample(self, frame: np.ndarray) -> np.ndarray:
+        # The ratio is a relative pixel count, so a strided view keeps threshold semantics intact.
+        if self._downsample == 1:
+            return frame
+        return frame[:: self._downsample, :: self._downsample]
 
-    def has_red(self, frame_bgr: np.ndarray, threshold: float) -> bool:
-        return self.red_ratio(frame_bgr) >= threshold
+    def red_ratio(self, frame: np.ndarray, hsv: Optional[np.ndarray] = None) -> float:
+        if hsv is None:
+            hsv = cv2.cvtColor(self.sample(frame), cv2.COLOR_BGR2HSV)
+        mask, section = self._scratch(hsv.shape[:2])
+        cv2.inRange(hsv, self._lowers[0], self._uppers[0], dst=mask)
+        for lower, upper in zip(self._lowers[1:], self._uppers[1:]):
+            cv2.inRange(hsv, lower, upper, dst=section)
+            cv2.bitwise_or(mask, section, dst=mask)
+        return float(cv2.countNonZero(mask)) / float(mask.size)
+
+    def has_red(self, frame: np.ndarray, threshold: float) -> bool:
+        return self.red_ratio(frame) >= threshold
 
 
 class TemplateMatcher:
-    def __init__(self, template_configs: Dict[str, TemplateConfig]):
+    def __init__(self, template_configs: Dict[str, TemplateConfig], use_opencl: bool = True):
         self._templates = template_configs
-        self._cache: Dict[str, Tuple[np.ndarray, float]] = {}
+        self._cache: Dict[str, Tuple[np.ndarray, float]] = {
+            name: (self._read_template(config), config.threshold) for name, config in template_configs.items()
+        }
+        self._use_opencl = use_opencl and cv2.ocl.haveOpenCL()
+        self._device_cache: Dict[str, cv2.UMat] = {}
+        if self._use_opencl:
+            cv2.ocl.setUseOpenCL(True)
+            self._device_cache = {name: cv2.UMat(image) for name, (image, _threshold) in self._cache.items()}
+            LOGGER.info("OpenCL available; template matching runs through UMat")
 
     def is_configured(self) -> bool:
         return bool(self._templates)
 
-    def _load_template(self, name: str) -> Tuple[np.ndarray, float]:
-        if name not in self._templates:
-            raise KeyError(f"Template {name} not defined in configuration")
-        if name in self._cache:
-            return self._cache[name]
-        config = self._templates[name]
+    @staticmethod
+    def _read_template(config: TemplateConfig) -> np.ndarray:
         if not config.path.exists():
             raise FileNotFoundError(f"Template image not found: {config.path}")
         image = cv2.imread(str(config.path), cv2.IMREAD_GRAYSCALE)
         if image is None:
             raise RuntimeError(f"Failed to load template image: {config.path}")
-        self._cache[name] = (image, config.threshold)
-        return self._cache[name]
+        return np.ascontiguousarray(image)
+
+    def _load_template(self, name: str) -> Tuple[np.ndarray, float]:
+        try:
+            return self._cache[name]
+        except KeyError:
+            raise KeyError(f"Template {name} not defined in configuration") from None
+
+    def upload(self, frame_gray: np.ndarray) -> Optional[cv2.UMat]:
+        return cv2.UMat(frame_gray) if self._use_opencl else None
 
-    def match(self, frame_bgr: np.ndarray, template_name: str) -> Tuple[bool, float]:
+    @staticmethod
+    def _search_window(
+        frame_shape: Tuple[int, ...], template_shape: Tuple[int, ...], search_area: Region
+    ) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+        template_height, template_width = template_shape[:2]
+        top = max(0, search_area.top - template_height)
+        bottom = min(frame_shape[0], search_area.top + search_area.height + template_height)
+        left = max(0, search_area.left - template_width)
+        right = min(frame_shape[1], search_area.left + search_area.width + template_width)
+        return (top, max(top, bottom)), (left, max(left, right))
+
+    def match(
+        self,
+        frame_gray: np.ndarray,
+        template_name: str,
+        frame_device: Optional[cv2.UMat] = None,
+        search_area: Optional[Region] = None,
+    ) -> Tuple[bool, float]:
         template, threshold = self._load_template(template_name)
-        frame_gray = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2GRAY)
+        if search_area is not None:
+            rows, cols = self._search_window(frame_gray.shape, template.shape, search_area)
+            frame_gray = frame_gray[rows[0] : rows[1], cols[0] : cols[1]]
+            if frame_device is not None:
+                frame_device = cv2.UMat(frame_device, rows, cols)
         if frame_gray.shape[0] < template.shape[0] or frame_gray.shape[1] < template.shape[1]:
             LOGGER.warning("Frame smaller than template %s; skipping match", template_name)
             return False, 0.0
-        res = cv2.matchTemplate(frame_gray, template, cv2.TM_CCOEFF_NORMED)
-        _min_val, max_val, _min_loc, _max_loc = cv2.minMaxLoc(res)
+        sqdiff = self._templates[template_name].method == "sqdiff"
+        method = cv2.TM_SQDIFF if sqdiff else cv2.TM_CCOEFF_NORMED
+        if self._use_opencl:
+            if frame_device is None:
+                frame_device = cv2.UMat(frame_gray)
+            res = cv2.matchTemplate(frame_device, self._device_cache[template_name], method)
+        else:
+            res = cv2.matchTemplate(frame_gray, template, method)
+        min_val, max_val, _min_loc, _max_loc = cv2.minMaxLoc(res)
+        if sqdiff:
+            # Map the best squared difference onto [0, 1] so higher still means a closer match.
+            max_val = 1.0 - min_val / (template.size * 255.0**2)
         return max_val >= threshold, float(max_val)
 
 
@@ -108,33 +194,107 @@ class DetectionManager:
     def __init__(self, config: AppConfig):
         self._config = config
         self._grabber = ScreenGrabber(config.monitor)
-        self._color_detector = ColorDetector(config.hsv_ranges)
-        self._template_matcher = TemplateMatcher(config.templates)
+        self._color_detector = ColorDetector(config.hsv_ranges, downsample=config.detection.color_downsample)
+        self._template_matcher = TemplateMatcher(config.templates, use_opencl=config.detection.use_opencl)
         self._last_frames: Dict[str, np.ndarray] = {}
+        # One grab per cycle covering every trade region, not the whole monitor.
+        self._capture_area = MappingProxyType(self._bounding_area(config).to_monitor())
+        self._cycle_frame: Optional[np.ndarray] = None
+        self._local = threading.local()
+        workers = min(len(config.trades), os.cpu_count() or 1)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="trade-detect") if workers > 1 else None
+        self._prev_frames: Dict[str, np.ndarray] = {}
+        self._prev_status: Dict[str, TradeStatus] = {}
+        self._reuse_counts: Dict[str, int] = {}
 
     @property
     def last_frames(self) -> Dict[str, np.ndarray]:
         return self._last_frames
 
-    def evaluate_trade(self, trade: TradeConfig) -> TradeStatus:
-        frame = self._grabber.grab(trade.region)
+    def _buffer(self, kind: str, shape: Tuple[int, ...]) -> np.ndarray:
+        buffers: Optional[Dict[Tuple[int, ...], np.ndarray]] = getattr(self._local, kind, None)
+        if buffers is None:
+            buffers = {}
+            setattr(self._local, kind, buffers)
+        buffer = buffers.get(shape)
+        if buffer is None:
+            buffer = np.empty(shape, dtype=np.uint8)
+            buffers[shape] = buffer
+        return buffer
+
+    def _reuse_status(self, trade: TradeConfig, frame: np.ndarray) -> Optional[TradeStatus]:
+        settings = self._config.detection
+        previous = self._prev_frames.get(trade.name)
+        status = self._prev_status.get(trade.name)
+        if settings.change_threshold <= 0 or previous is None or status is None or previous.shape != frame.shape:
+            return None
+        if self._reuse_counts.get(trade.name, 0) >= settings.max_reuse_cycles:
+            return None
+        if _region_changed(previous, frame, _change_limit(trade, settings), self._buffer("diff", frame.shape)):
+            return None
+        self._reuse_counts[trade.name] = self._reuse_counts.get(trade.name, 0) + 1
+        return status
+
+    @staticmethod
+    def _bounding_area(config: AppConfig) -> Region:
+        areas = [trade.monitor_dict for trade in config.trades]
+        if not areas:
+            return config.monitor
+        left = min(area["left"] for area in areas)
+        top = min(area["top"] for area in areas)
+        right = max(area["left"] + area["width"] for area in areas)
+        bottom = max(area["top"] + area["height"] for area in areas)
+        return Region(left=left, top=top, width=right - left, height=bottom - top)
+
+    def _capture_cycle(self) -> None:
+        self._cycle_frame = self._grabber.grab_area(self._capture_area)
+
+    def _region_view(self, trade: TradeConfig) -> np.ndarray:
+        bounded = trade.monitor_dict
+        top = bounded["top"] - self._capture_area["top"]
+        left = bounded["left"] - self._capture_area["left"]
+        return self._cycle_frame[top : top + bounded["height"], left : left + bounded["width"]]
+
+    def _search_area(self, trade: TradeConfig) -> Optional[Region]:
+        roi = trade.start_button_roi
+        if roi is None:
+            return None
+        bounded = trade.monitor_dict
+        return Region(left=roi.left - bounded["left"], top=roi.top - bounded["top"], width=roi.width, height=roi.height)
+
+    # Only valid inside evaluate_all, which captures the frame this slices.
+    def _evaluate_trade(self, trade: TradeConfig) -> TradeStatus:
+        frame = self._region_view(trade)
         self._last_frames[trade.name] = frame
-        ratio = self._color_detector.red_ratio(frame)
+        cached = self._reuse_status(trade, frame)
+        if cached is not None:
+            return cached
+        sampled = self._color_detector.sample(frame)
+        hsv = cv2.cvtColor(sampled, cv2.COLOR_BGR2HSV, dst=self._buffer("hsv", sampled.shape[:2] + (3,)))
+        ratio = self._color_detector.red_ratio(frame, hsv=hsv)
         has_red = ratio >= trade.red_ratio_threshold
 
         start_active = None
         start_disabled = None
         score = None
-        if trade.start_template and self._template_matcher.is_configured():
-            active, score_val = self._template_matcher.match(frame, trade.start_template)
+        gray = None
+        gray_device = None
+        if self._template_matcher.is_configured() and (trade.start_template or trade.start_gray_template):
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGRA2GRAY, dst=self._buffer("gray", frame.shape[:2]))
+            gray_device = self._template_matcher.upload(gray)
+        search_area = self._search_area(trade)
+        if trade.start_template and gray is not None:
+            active, score_val = self._template_matcher.match(gray, trade.start_template, gray_device, search_area)
             start_active = bool(active)
             score = score_val
-        if trade.start_gray_template and self._template_matcher.is_configured():
-            disabled, score_val = self._template_matcher.match(frame, trade.start_gray_template)
+        if trade.start_gray_template and gray is not None:
+            disabled, score_val = self._template_matcher.match(
+                gray, trade.start_gray_template, gray_device, search_area
+            )
             start_disabled = bool(disabled)
             score = max(score or 0.0, score_val)
 
-        return TradeStatus(
+        status = TradeStatus(
             name=trade.name,
             red_ratio=ratio,
             has_red_gem=has_red,
@@ -142,24 +302,51 @@ class DetectionManager:
             start_disabled=start_disabled,
             template_score=score,
         )
+        # Copy so the cached frame does not keep the whole monitor capture alive.
+        self._prev_frames[trade.name] = frame.copy()
+        self._prev_status[trade.name] = status
+        self._reuse_counts[trade.name] = 0
+        return status
 
     def capture_monitor(self) -> np.ndarray:
         return self._grabber.grab_monitor()
 
+    @staticmethod
+    def _failed_status(trade: TradeConfig) -> TradeStatus:
+        return TradeStatus(
+            name=trade.name,
+            red_ratio=0.0,
+            has_red_gem=False,
+            start_active=None,
+            start_disabled=None,
+            template_score=None,
+        )
+
+    def _evaluate_safe(self, trade: TradeConfig) -> TradeStatus:
+        try:
+            return self._evaluate_trade(trade)
+        except Exception as exc:
+            LOGGER.exception("Failed to evaluate trade %s: %s", trade.name, exc)
+            return self._failed_status(trade)
+
     def evaluate_all(self) -> List[TradeStatus]:
-        statuses: List[TradeStatus] = []
-        for trade in self._config.trades:
+        trades = self._config.trades
+        try:
+            self._capture_cycle()
+        except Exception as exc:
+            LOGGER.exception("Failed to capture monitor: %s", exc)
+            return [self._failed_status(trade) for trade in trades]
+        # OpenCV releases the GIL, so trades run in parallel over read-only views of the capture.
+        # close() may run concurrently from another thread, so read the pool once.
+        pool = self._pool
+        if pool is not None:
             try:
-                status = self.evaluate_trade(trade)
-            except Exception as exc:
-                LOGGER.exception("Failed to evaluate trade %s: %s", trade.name, exc)
-                status = TradeStatus(
-                    name=trade.name,
-                    red_ratio=0.0,
-                    has_red_gem=False,
-                    start_active=None,
-                    start_disabled=None,
-                    template_score=None,
-                )
-            statuses.append(status)
-        return statuses
+                return list(pool.map(self._evaluate_safe, trades))
+            except RuntimeError:
+                LOGGER.debug("Detection pool shut down; evaluating sequentially")
+        return [self._evaluate_safe(trade) for trade in trades]
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
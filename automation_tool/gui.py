@@ -1,20 +1,41 @@
 from __future__ import annotations
 
 import logging
+import queue
+import threading
 import tkinter as tk
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
 
-import cv2
-from PIL import Image, ImageTk
 from tkinter import ttk
 
 from .controller import AutomationController
 
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import numpy as np
+    from PIL import Image, ImageTk
+
+    from .detection import TradeStatus
+    from .preview import PreviewEncoder
+
 LOGGER = logging.getLogger(__name__)
 
+# Applies a whole table update in one Python->Tcl crossing; the lists are
+# flat (iid, text, values) / (iid, column, value) triples.
+_APPLY_ROWS_PROC = """
+proc ::automation_apply_rows {tree inserts items sets deletes} {
+    foreach {iid text values} $inserts { $tree insert {} end -id $iid -text $text -values $values }
+    foreach {iid text values} $items { $tree item $iid -text $text -values $values }
+    foreach {iid column value} $sets { $tree set $iid $column $value }
+    if {[llength $deletes]} { $tree delete $deletes }
+}
+"""
+
 
 class AutomationGUI:
+    _COLUMNS = ("red", "active", "disabled", "score")
+    _HIDDEN_INTERVAL_MS = 2000
+
     def __init__(self, controller: AutomationController):
         self._controller = controller
         self._root = tk.Tk()
@@ -22,11 +43,33 @@ class AutomationGUI:
         self._root.protocol("WM_DELETE_WINDOW", self._on_close)
 
         self._status_var = tk.StringVar(value="Status: stopped")
+        if controller.load_error:
+            self._status_var.set(f"Status: config error: {controller.load_error}")
         self._pause_state = tk.StringVar(value="Pause")
         self._image_label: Optional[tk.Label] = None
         self._image_handle: Optional[ImageTk.PhotoImage] = None
+        self._preview_name: Optional[str] = None
+        # Created by the preview thread on the first frame.
+        self._encoder: Optional[PreviewEncoder] = None
+        self._seen_statuses: Optional[Tuple[object, int]] = None
+        self._rows: List[Tuple[str, Tuple[str, ...]]] = []
+        self._seen_frames: Optional[Tuple[object, int]] = None
+        # Held (not just its id) so identity can't match a recycled object.
+        self._last_frame: Optional[np.ndarray] = None
+        self._after_id: Optional[str] = None
+        # Set from the signal handler; the F10 hotkey only stops the engine.
+        self._close_requested = threading.Event()
+
+        # Previews are encoded off the Tk thread; the queue holds only the newest one.
+        self._preview_queue: "queue.Queue[Tuple[Optional[str], Optional[Image.Image]]]" = queue.Queue(maxsize=1)
+        self._preview_visible = threading.Event()
+        self._preview_stop = threading.Event()
+        self._preview_thread = threading.Thread(target=self._preview_loop, name="gui-preview", daemon=True)
 
         self._build_layout()
+        self._root.bind("<Map>", self._on_map)
+        self._root.bind("<Unmap>", self._on_unmap)
+        self._preview_thread.start()
         self._schedule_update()
 
     def _build_layout(self) -> None:
@@ -52,8 +95,7 @@ class AutomationGUI:
         self._root.grid_rowconfigure(1, weight=1)
         self._root.grid_columnconfigure(0, weight=1)
 
-        columns = ("red", "active", "disabled", "score")
-        self._tree = ttk.Treeview(tree_frame, columns=columns, show="headings", height=6)
+        self._tree = ttk.Treeview(tree_frame, columns=self._COLUMNS, show="headings", height=6)
         self._tree.heading("red", text="Red Ratio")
         self._tree.heading("active", text="Start Active")
         self._tree.heading("disabled", text="Start Disabled")
@@ -63,6 +105,7 @@ class AutomationGUI:
         self._tree.column("disabled", width=110)
         self._tree.column("score", width=110)
         self._tree.pack(fill="both", expand=True)
+        self._tree.tk.eval(_APPLY_ROWS_PROC)
 
         preview_frame = ttk.Labelframe(self._root, text="Preview", padding=10)
         preview_frame.grid(row=2, column=0, sticky="nsew", padx=10, pady=5)
@@ -70,7 +113,11 @@ class AutomationGUI:
         self._image_label.pack(fill="both", expand=True)
 
     def _on_start(self) -> None:
-        self._controller.start()
+        try:
+            self._controller.start()
+        except RuntimeError:
+            self._show_load_error()
+            return
         self._status_var.set("Status: running")
 
     def _on_stop(self) -> None:
@@ -78,7 +125,11 @@ class AutomationGUI:
         self._status_var.set("Status: stopped")
 
     def _on_pause(self) -> None:
-        paused = self._controller.toggle_pause()
+        try:
+            paused = self._controller.toggle_pause()
+        except RuntimeError:
+            self._show_load_error()
+            return
         if paused:
             self._pause_state.set("Resume")
             self._status_var.set("Status: paused")
@@ -87,43 +138,156 @@ class AutomationGUI:
             self._status_var.set("Status: running")
 
     def _on_reload(self) -> None:
-        self._controller.reload_config()
+        try:
+            self._controller.reload_config()
+        except Exception as exc:
+            LOGGER.error("Reload failed: %s", exc)
+            self._show_load_error()
+            return
         self._status_var.set("Status: config reloaded")
 
+    def _show_load_error(self) -> None:
+        self._status_var.set(f"Status: config error: {self._controller.load_error or 'engine not available'}")
+
     def _schedule_update(self) -> None:
+        self._after_id = None
+        if self._close_requested.is_set():
+            self._on_close()
+            return
+        if self._root.state() == "iconic" or not self._root.winfo_ismapped():
+            # Hidden: only keep polling for a close request; <Map> resumes immediately.
+            self._preview_visible.clear()
+            self._after_id = self._root.after(self._HIDDEN_INTERVAL_MS, self._schedule_update)
+            return
+        self._preview_visible.set()
         self._update_status()
-        self._root.after(1000, self._schedule_update)
+        self._apply_preview()
+        self._after_id = self._root.after(self._update_interval_ms(), self._schedule_update)
+
+    def _on_map(self, event: tk.Event) -> None:
+        if event.widget is not self._root:
+            return
+        if self._after_id is not None:
+            self._root.after_cancel(self._after_id)
+        self._schedule_update()
+
+    def _on_unmap(self, event: tk.Event) -> None:
+        if event.widget is self._root:
+            self._preview_visible.clear()
+
+    def _update_interval_ms(self) -> int:
+        try:
+            framerate = self._controller.config.gui.maximum_framerate
+        except RuntimeError:
+            framerate = 1.0
+        return max(1, int(1000 / framerate))
 
     def _update_status(self) -> None:
         try:
-            statuses = self._controller.engine.statuses
-        except Exception:
-            statuses = []
-        self._tree.delete(*self._tree.get_children())
-        for status in statuses:
-            self._tree.insert(
-                "",
-                tk.END,
-                values=(
-                    f"{status.red_ratio:.3f}",
+            engine = self._controller.engine
+        except RuntimeError:
+            return
+
+        statuses_key = (engine, engine.statuses_version)
+        if statuses_key != self._seen_statuses:
+            self._seen_statuses = statuses_key
+            self._render_rows(engine.statuses)
+
+    def _render_rows(self, statuses: Sequence[TradeStatus]) -> None:
+        rows = [
+            (
+                status.name,
+                (
+                    format(status.red_ratio, ".3f"),
                     self._bool_to_text(status.start_active),
                     self._bool_to_text(status.start_disabled),
-                    f"{status.template_score:.2f}" if status.template_score is not None else "-",
+                    format(status.template_score, ".2f") if status.template_score is not None else "-",
                 ),
-                text=status.name,
             )
+            for status in statuses
+        ]
+        # Rows are keyed by position and reused in place: existing items are
+        # retargeted rather than deleted and re-inserted when the trades change.
+        inserts: List[object] = []
+        items: List[object] = []
+        sets: List[str] = []
+        for index, (name, values) in enumerate(rows):
+            iid = str(index)
+            if index >= len(self._rows):
+                inserts.extend((iid, name, values))
+            elif self._rows[index][0] != name:
+                items.extend((iid, name, values))
+            else:
+                for column, old, new in zip(self._COLUMNS, self._rows[index][1], values):
+                    if old != new:
+                        sets.extend((iid, column, new))
+        deletes = [str(index) for index in range(len(rows), len(self._rows))]
+        self._rows = rows
+        if inserts or items or sets or deletes:
+            self._tree.tk.call(
+                "::automation_apply_rows", self._tree, tuple(inserts), tuple(items), tuple(sets), tuple(deletes)
+            )
+
+    def _preview_loop(self) -> None:
+        while not self._preview_stop.wait(self._update_interval_ms() / 1000.0):
+            if not self._preview_visible.is_set():
+                continue
+            try:
+                self._encode_preview()
+            except Exception as exc:
+                LOGGER.exception("Failed to encode preview: %s", exc)
+
+    def _encode_preview(self) -> None:
+        try:
+            engine = self._controller.engine
+        except RuntimeError:
+            return
+        frames_key = (engine, engine.frames_version)
+        if frames_key == self._seen_frames:
+            return
+        self._seen_frames = frames_key
+        primary = engine.primary_frame()
+        if primary is None:
+            self._last_frame = None
+            self._offer_preview(None, None)
+            return
+        name, frame = primary
+        if frame is self._last_frame:
+            return
+        self._last_frame = frame
+        if self._encoder is None:
+            # Imported here so Pillow is only loaded once there is a frame to show.
+            from .preview import PreviewEncoder
+
+            self._encoder = PreviewEncoder()
+        self._offer_preview(name, self._encoder.encode(frame))
+
+    def _offer_preview(self, name: Optional[str], image: Optional[Image.Image]) -> None:
+        try:
+            self._preview_queue.get_nowait()
+        except queue.Empty:
+            pass
+        self._preview_queue.put_nowait((name, image))
 
-        frames = self._controller.engine.last_frames() if self._controller.engine else {}
-        if frames:
-            name, frame = next(iter(frames.items()))
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            image = Image.fromarray(rgb)
-            image = image.resize((min(320, image.width), min(240, image.height)))
-            self._image_handle = ImageTk.PhotoImage(image=image)
-            if self._image_label:
-                self._image_label.configure(image=self._image_handle, text=f"{name} preview")
-        elif self._image_label:
+    def _apply_preview(self) -> None:
+        try:
+            name, image = self._preview_queue.get_nowait()
+        except queue.Empty:
+            return
+        if not self._image_label:
+            return
+        if image is None or self._encoder is None:
+            self._image_handle = None
+            self._preview_name = None
             self._image_label.configure(image="", text="No preview available")
+            return
+        handle = self._encoder.paste(self._image_handle, image)
+        if handle is not self._image_handle:
+            self._image_handle = handle
+            self._image_label.configure(image=handle)
+        if name != self._preview_name:
+            self._preview_name = name
+            self._image_label.configure(text=f"{name} preview")
 
     @staticmethod
     def _bool_to_text(value: Optional[bool]) -> str:
@@ -132,8 +296,14 @@ class AutomationGUI:
         return "Yes" if value else "No"
 
     def _on_close(self) -> None:
+        self._preview_stop.set()
+        if self._preview_thread.is_alive():
+            self._preview_thread.join(timeout=1.0)
         self._controller.shutdown()
         self._root.destroy()
 
+    def request_close(self) -> None:
+        self._close_requested.set()
+
     def run(self) -> None:
         self._root.mainloop()
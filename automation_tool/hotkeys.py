@@ -2,11 +2,12 @@ from __future__ import annotations
 
 import logging
 import threading
-import time
-from typing import Callable, Optional
+from typing import Callable, Dict, FrozenSet, List, Optional, Set
 
 LOGGER = logging.getLogger(__name__)
 
+_KEY_ALIASES = {"control": "ctrl", "win": "cmd", "windows": "cmd", "super": "cmd", "return": "enter"}
+
 try:  # pragma: no cover - optional
     import keyboard  # type: ignore
 except Exception:
@@ -17,13 +18,160 @@ try:  # pragma: no cover - optional fallback
 except Exception:
     pynput_keyboard = None
 
+try:  # pragma: no cover - Windows only
+    import ctypes
+    from ctypes import wintypes
+
+    _user32 = ctypes.WinDLL("user32", use_last_error=True)
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+except Exception:
+    _user32 = None
+    _kernel32 = None
+
+
+_MODIFIER_VKS = {
+    "ctrl": frozenset({0x11, 0xA2, 0xA3}),
+    "shift": frozenset({0x10, 0xA0, 0xA1}),
+    "alt": frozenset({0x12, 0xA4, 0xA5}),
+    "cmd": frozenset({0x5B, 0x5C}),
+}
+_NAMED_VKS = {
+    "backspace": 0x08,
+    "tab": 0x09,
+    "enter": 0x0D,
+    "pause": 0x13,
+    "esc": 0x1B,
+    "escape": 0x1B,
+    "space": 0x20,
+    "page_up": 0x21,
+    "page_down": 0x22,
+    "end": 0x23,
+    "home": 0x24,
+    "left": 0x25,
+    "up": 0x26,
+    "right": 0x27,
+    "down": 0x28,
+    "print_screen": 0x2C,
+    "insert": 0x2D,
+    "delete": 0x2E,
+    "scroll_lock": 0x91,
+}
+
+
+class _WinLLHookBackend:  # pragma: no cover - Windows hardware interaction
+    # WH_KEYBOARD_LL hook compared on virtual-key codes, so non-hotkey keys cost one set lookup.
+    WH_KEYBOARD_LL = 13
+    WM_QUIT = 0x0012
+    WM_USER = 0x0400
+    WM_KEYDOWN = 0x0100
+    WM_SYSKEYDOWN = 0x0104
+    WM_KEYUP = 0x0101
+    WM_SYSKEYUP = 0x0105
+    PM_NOREMOVE = 0x0000
+
+    def __init__(self, vk_groups: List[FrozenSet[int]], callback: Callable[[], None]):
+        self._vk_groups = vk_groups
+        self._hotkey_vks = frozenset().union(*vk_groups)
+        self._callback = callback
+        self._pressed: Set[int] = set()
+        self._thread_id: Optional[int] = None
+        self._proc = None
+
+    @staticmethod
+    def available() -> bool:
+        return _user32 is not None
+
+    @staticmethod
+    def resolve(key_names: FrozenSet[str]) -> Optional[List[FrozenSet[int]]]:
+        groups: List[FrozenSet[int]] = []
+        for name in key_names:
+            if name in _MODIFIER_VKS:
+                groups.append(_MODIFIER_VKS[name])
+            elif name in _NAMED_VKS:
+                groups.append(frozenset({_NAMED_VKS[name]}))
+            elif len(name) == 1 and name.isascii() and name.isalnum():
+                groups.append(frozenset({ord(name.upper())}))
+            elif name[:1] == "f" and name[1:].isdigit() and 1 <= int(name[1:]) <= 24:
+                groups.append(frozenset({0x70 + int(name[1:]) - 1}))
+            else:
+                return None
+        return groups or None
+
+    def run(self, stop_event: threading.Event) -> None:
+        LRESULT = ctypes.c_ssize_t
+        HOOKPROC = ctypes.WINFUNCTYPE(LRESULT, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
+
+        class KBDLLHOOKSTRUCT(ctypes.Structure):
+            _fields_ = [
+                ("vkCode", wintypes.DWORD),
+                ("scanCode", wintypes.DWORD),
+                ("flags", wintypes.DWORD),
+                ("time", wintypes.DWORD),
+                ("dwExtraInfo", ctypes.c_size_t),
+            ]
+
+        _user32.SetWindowsHookExW.argtypes = [ctypes.c_int, HOOKPROC, wintypes.HINSTANCE, wintypes.DWORD]
+        _user32.SetWindowsHookExW.restype = wintypes.HHOOK
+        _user32.CallNextHookEx.argtypes = [wintypes.HHOOK, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM]
+        _user32.CallNextHookEx.restype = LRESULT
+        _user32.UnhookWindowsHookEx.argtypes = [wintypes.HHOOK]
+        _user32.GetMessageW.argtypes = [ctypes.POINTER(wintypes.MSG), wintypes.HWND, wintypes.UINT, wintypes.UINT]
+        _user32.PeekMessageW.argtypes = [
+            ctypes.POINTER(wintypes.MSG),
+            wintypes.HWND,
+            wintypes.UINT,
+            wintypes.UINT,
+            wintypes.UINT,
+        ]
+        _user32.PostThreadMessageW.argtypes = [wintypes.DWORD, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM]
+        _kernel32.GetModuleHandleW.argtypes = [wintypes.LPCWSTR]
+        _kernel32.GetModuleHandleW.restype = wintypes.HMODULE
+
+        def hook_proc(n_code, w_param, l_param):
+            if n_code >= 0:
+                vk = ctypes.cast(l_param, ctypes.POINTER(KBDLLHOOKSTRUCT)).contents.vkCode
+                if vk in self._hotkey_vks:
+                    if w_param in (self.WM_KEYDOWN, self.WM_SYSKEYDOWN):
+                        self._pressed.add(vk)
+                        if all(group & self._pressed for group in self._vk_groups):
+                            # Hooks must return quickly, and the callback may stop this listener.
+                            threading.Thread(target=self._callback, name="hotkey-callback", daemon=True).start()
+                    elif w_param in (self.WM_KEYUP, self.WM_SYSKEYUP):
+                        self._pressed.discard(vk)
+            return _user32.CallNextHookEx(None, n_code, w_param, l_param)
+
+        msg = wintypes.MSG()
+        # Create this thread's message queue before publishing its id so stop() can post to it.
+        _user32.PeekMessageW(ctypes.byref(msg), None, self.WM_USER, self.WM_USER, self.PM_NOREMOVE)
+        self._thread_id = _kernel32.GetCurrentThreadId()
+        if stop_event.is_set():
+            return
+        self._proc = HOOKPROC(hook_proc)
+        hook = _user32.SetWindowsHookExW(self.WH_KEYBOARD_LL, self._proc, _kernel32.GetModuleHandleW(None), 0)
+        if not hook:
+            raise ctypes.WinError(ctypes.get_last_error())
+        try:
+            while _user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+                _user32.TranslateMessage(ctypes.byref(msg))
+                _user32.DispatchMessageW(ctypes.byref(msg))
+        finally:
+            _user32.UnhookWindowsHookEx(hook)
+            self._proc = None
+
+    def stop(self) -> None:
+        if self._thread_id is not None:
+            _user32.PostThreadMessageW(self._thread_id, self.WM_QUIT, 0, 0)
+
 
 class HotkeyListener:
     def __init__(self, hotkey: str, callback: Callable[[], None]):
         self._hotkey = hotkey
+        self._hotkey_keys = frozenset(self._normalize_key_name(part) for part in hotkey.split("+") if part.strip())
         self._callback = callback
         self._thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
+        # Guards _listener; _detach is the only place that tears a backend down.
+        self._lock = threading.Lock()
         self._listener = None
 
     def start(self) -> None:
@@ -36,43 +184,89 @@ class HotkeyListener:
 
     def stop(self) -> None:
         self._stop_event.set()
+        # Tearing the backend down also unblocks listener.join() / the hook's
+        # message loop in _run; anything published later is refused by _publish.
+        self._detach()
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=1.0)
-        self._detach()
         LOGGER.info("Hotkey listener stopped")
 
+    def _publish(self, kind: str, attach: Callable[[], object]) -> bool:
+        with self._lock:
+            if self._stop_event.is_set():
+                return False
+            self._listener = (kind, attach())
+            return True
+
     def _run(self) -> None:  # pragma: no cover - hardware interaction
         if keyboard:
-            handle = keyboard.add_hotkey(self._hotkey, self._safe_callback)
-            self._listener = ("keyboard", handle)
-            try:
-                while not self._stop_event.is_set():
-                    time.sleep(0.1)
-            finally:
-                keyboard.remove_hotkey(handle)
-                self._listener = None
+            if self._publish("keyboard", lambda: keyboard.add_hotkey(self._hotkey, self._safe_callback)):
+                self._stop_event.wait()
             return
+        vk_groups = _WinLLHookBackend.resolve(self._hotkey_keys) if _WinLLHookBackend.available() else None
+        if vk_groups:
+            backend = _WinLLHookBackend(vk_groups, self._safe_callback)
+            if not self._publish("win32", lambda: backend):
+                return
+            try:
+                backend.run(self._stop_event)
+                return
+            except OSError as exc:
+                LOGGER.warning("Win32 keyboard hook unavailable (%s); trying pynput", exc)
+                with self._lock:
+                    self._listener = None
         if pynput_keyboard:
+            # One bit per hotkey key; each pynput key object is resolved to its
+            # bit once, so steady-state events are a dict lookup and an int compare.
+            bits = {name: 1 << index for index, name in enumerate(sorted(self._hotkey_keys))}
+            target = (1 << len(bits)) - 1
+            key_bits: Dict[object, int] = {}
+            down = 0
+
+            def bit_for(key) -> int:
+                bit = key_bits.get(key)
+                if bit is None:
+                    try:
+                        name = key.char if key.char else str(key).split(".")[-1]
+                    except AttributeError:
+                        name = str(key).split(".")[-1]
+                    bit = key_bits[key] = bits.get(self._normalize_key_name(name), 0)
+                return bit
+
             def on_press(key):
-                try:
-                    key_name = key.char.lower() if key.char else str(key).split(".")[-1]
-                except AttributeError:
-                    key_name = str(key)
-                if key_name.lower() == self._hotkey.lower() and not self._stop_event.is_set():
-                    self._safe_callback()
+                nonlocal down
+                bit = bit_for(key)
+                # Only the hotkey's own keys count, as with the Win32 hook: other held
+                # keys (or one whose release pynput missed) must not block it.
+                if bit:
+                    down |= bit
+                    if down == target and not self._stop_event.is_set():
+                        self._safe_callback()
                 return not self._stop_event.is_set()
 
-            listener = pynput_keyboard.Listener(on_press=on_press)
-            self._listener = ("pynput", listener)
-            listener.start()
-            while not self._stop_event.is_set():
-                time.sleep(0.1)
-            listener.stop()
-            listener.join()
-            self._listener = None
+            def on_release(key):
+                nonlocal down
+                down &= ~bit_for(key)
+
+            listener = pynput_keyboard.Listener(on_press=on_press, on_release=on_release)
+
+            def attach():
+                listener.start()
+                return listener
+
+            if self._publish("pynput", attach):
+                listener.join()
             return
         LOGGER.warning("No hotkey backend available; hotkey %s disabled", self._hotkey)
 
+    @staticmethod
+    def _normalize_key_name(name: str) -> str:
+        name = name.strip().lower()
+        # pynput reports sided modifiers (ctrl_l, shift_r); hotkeys name the plain key.
+        if name.endswith(("_l", "_r")) and len(name) > 2:
+            name = name[:-2]
+        return _KEY_ALIASES.get(name, name)
+
     def _safe_callback(self) -> None:
         try:
             self._callback()
@@ -80,9 +274,12 @@ class HotkeyListener:
             LOGGER.exception("Hotkey callback failed: %s", exc)
 
     def _detach(self) -> None:
-        if self._listener and self._listener[0] == "keyboard" and keyboard:
-            keyboard.remove_hotkey(self._listener[1])
-        if self._listener and self._listener[0] == "pynput":
-            # pynput listener is already stopped in _run
-            pass
-        self._listener = None
+        with self._lock:
+            listener, self._listener = self._listener, None
+        if not listener:
+            return
+        kind, handle = listener
+        if kind == "keyboard" and keyboard:
+            keyboard.remove_hotkey(handle)
+        elif kind in ("pynput", "win32"):
+            handle.stop()
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+import PIL
+from PIL import Image, ImageTk
+
+LOGGER = logging.getLogger(__name__)
+
+
+class PreviewEncoder:
+    def __init__(self, max_size: Tuple[int, int] = (320, 240)):
+        LOGGER.info("Using Pillow %s", PIL.__version__)
+
+        self._max_size = max_size
+        self._source: Optional[Tuple[int, ...]] = None
+        self._target: Optional[Tuple[int, int]] = None
+        self._code = 0
+        self._resize_buf: Optional[np.ndarray] = None
+        self._rgba_buf: Optional[np.ndarray] = None
+        self._image: Optional[Image.Image] = None
+        # The PIL image maps _rgba_buf, so encoding and pasting must not overlap.
+        self._lock = threading.Lock()
+
+    def encode(self, frame: np.ndarray) -> Image.Image:
+        if frame.shape != self._source:
+            # Buffers are sized per source shape so resize/cvtColor write in place.
+            self._source = frame.shape
+            width, height = min(self._max_size[0], frame.shape[1]), min(self._max_size[1], frame.shape[0])
+            self._target = (width, height)
+            self._code = cv2.COLOR_BGRA2RGBA if frame.shape[2:] == (4,) else cv2.COLOR_BGR2RGBA
+            self._resize_buf = np.empty((height, width) + frame.shape[2:], dtype=np.uint8)
+            with self._lock:
+                self._rgba_buf = np.empty((height, width, 4), dtype=np.uint8)
+                # PIL only maps (rather than copies) buffers for 4-byte modes like RGBA.
+                self._image = Image.frombuffer("RGBA", (width, height), self._rgba_buf, "raw", "RGBA", 0, 1)
+        # Shrink first so the channel swap only touches preview-sized data.
+        cv2.resize(frame, self._target, dst=self._resize_buf, interpolation=cv2.INTER_AREA)
+        with self._lock:
+            cv2.cvtColor(self._resize_buf, self._code, dst=self._rgba_buf)
+            # Captured alpha is not reliably opaque (GDI often leaves it at 0).
+            self._rgba_buf[..., 3] = 255
+        return self._image
+
+    def paste(self, handle: Optional[ImageTk.PhotoImage], image: Image.Image) -> ImageTk.PhotoImage:
+        if handle is None or (handle.width(), handle.height()) != image.size:
+            # Tk photos have a fixed size; only rebuild one when the preview size changes.
+            handle = ImageTk.PhotoImage(image.mode, image.size)
+        with self._lock:
+            handle.paste(image)
+        return handle
@@ -0,0 +1,39 @@
+import json
+from pathlib import Path
+
+from automation_tool.config_loader import ConfigLoader
+
+CONFIG = json.loads((Path(__file__).resolve().parent.parent / "config.json").read_text())
+
+
+def write_config(path, **overrides):
+    data = dict(CONFIG, templates={}, **overrides)
+    path.write_text(json.dumps(data))
+
+
+def test_unchanged_file_returns_cached_config(tmp_path):
+    path = tmp_path / "config.json"
+    write_config(path)
+    loader = ConfigLoader(path)
+    assert loader.load() is loader.load()
+
+
+def test_rewritten_file_is_reparsed(tmp_path):
+    path = tmp_path / "config.json"
+    write_config(path)
+    loader = ConfigLoader(path)
+    first = loader.load()
+    trades = [dict(CONFIG["trades"][0], name="renamed_slot")]
+    write_config(path, trades=trades)
+    second = loader.load()
+    assert second is not first
+    assert [trade.name for trade in second.trades] == ["renamed_slot"]
+
+
+def test_invalidate_forces_reparse(tmp_path):
+    path = tmp_path / "config.json"
+    write_config(path)
+    loader = ConfigLoader(path)
+    first = loader.load()
+    loader.invalidate()
+    assert loader.load() is not first
@@ -0,0 +1,68 @@
+import json
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("cv2")
+pytest.importorskip("mss")
+
+from automation_tool import controller as controller_module
+
+CONFIG = json.loads((Path(__file__).resolve().parent.parent / "config.json").read_text())
+
+
+class FakeEngine:
+    fail = False
+    built = []
+
+    def __init__(self, config):
+        if FakeEngine.fail:
+            raise FileNotFoundError("Template image not found")
+        FakeEngine.built.append(config)
+
+    def shutdown(self):
+        pass
+
+
+class FakeHotkeyListener:
+    def __init__(self, hotkey, callback):
+        pass
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+@pytest.fixture
+def config_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(controller_module, "AutomationEngine", FakeEngine)
+    monkeypatch.setattr(controller_module, "HotkeyListener", FakeHotkeyListener)
+    FakeEngine.fail = False
+    FakeEngine.built = []
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps(dict(CONFIG, templates={})))
+    return path
+
+
+def test_unchanged_config_keeps_engine(config_path):
+    controller = controller_module.AutomationController(config_path)
+    engine = controller.engine
+    controller.reload_config()
+    assert controller.engine is engine
+    assert len(FakeEngine.built) == 1
+
+
+def test_reload_after_failed_build_rebuilds_engine(config_path):
+    FakeEngine.fail = True
+    controller = controller_module.AutomationController(config_path)
+    assert controller.load_error
+    with pytest.raises(RuntimeError):
+        controller.engine
+
+    FakeEngine.fail = False
+    controller.reload_config()
+    assert controller.load_error is None
+    assert isinstance(controller.engine, FakeEngine)
+    assert len(FakeEngine.built) == 1
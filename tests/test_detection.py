@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+
+from automation_tool.config_loader import DetectionConfig, HSVRange, Point, Region, TradeConfig
+from automation_tool.detection import ColorDetector, _change_limit, _region_changed
+
+HSV_RANGES = HSVRange.from_sequence([[[0, 150, 120], [10, 255, 255]], [[170, 150, 120], [179, 255, 255]]])
+
+
+def test_gem_at_red_threshold_is_not_hidden_by_change_gate():
+    trade = TradeConfig(
+        name="slot",
+        region=Region(left=0, top=0, width=220, height=180),
+        start_button=Point(x=0, y=0),
+        red_ratio_threshold=0.02,
+    )
+    previous = np.full((180, 220, 4), (60, 60, 60, 255), dtype=np.uint8)
+    frame = previous.copy()
+    # 800 px = 2.02% of the region, in the dimmest red the shipped ranges accept.
+    frame[20:60, 40:60] = (49, 49, 120, 255)
+
+    detector = ColorDetector(HSV_RANGES)
+    assert detector.red_ratio(previous) < trade.red_ratio_threshold
+    assert detector.red_ratio(frame) >= trade.red_ratio_threshold
+    assert _region_changed(previous, frame, _change_limit(trade, DetectionConfig()))
+
+
+def test_unchanged_region_and_alpha_noise_allow_reuse():
+    previous = np.full((180, 220, 4), (60, 60, 60, 255), dtype=np.uint8)
+    frame = previous.copy()
+    frame[..., 3] = 0
+    assert not _region_changed(previous, frame, 0.1)